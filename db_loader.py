@@ -1,157 +1,238 @@
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 import csv
+import re
 import time
-from typing import List
+import weakref
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type
 
-from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy import Table, event
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel, create_engine
 from models import Bio, Stats
 
 
 HERE = Path(__file__).parent
 
+# engines whose tables have already been created this process (keyed by engine,
+# not URL: separate in-memory engines share a URL but not a database)
+_SCHEMA_CREATED: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+# plain decimal / scientific notation, including the ".125" style used for SH_PCT
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?").fullmatch
+
 
 def _coerce_int(value: str):
-    try:
+    # check the digits up front: empty cells are common and raising is slow
+    value = (value or "").strip()
+    if not value:
+        return None
+    digits = value[1:] if value[0] in "+-" else value
+    if digits.isdecimal():
+        return int(value)
+    try:  # rarer forms int() still accepts, e.g. "1_000"
         return int(value)
-    except Exception:
+    except ValueError:
         return None
 
 
 def _coerce_float(value: str):
-    try:
+    value = (value or "").strip()
+    if not value:
+        return None
+    if _FLOAT_RE(value):
         return float(value)
-    except Exception:
+    try:  # rarer forms float() still accepts, e.g. "inf"
+        return float(value)
+    except ValueError:
         return None
 
 
+_INT_FIELDS = frozenset({"GP", "G", "A", "PTS", "SH", "plus_minus", "PPG", "SHG", "FG", "GWG", "GTG", "OTG", "HTG", "UAG", "MIN", "MAJ", "OTH", "BLK", "Number"})
+
+# per-column coercers for `_stream_csv`, built once at import
+_BIO_DTYPE: Dict[str, Callable[[str], Any]] = {"Number": _coerce_int}
+_STATS_DTYPE: Dict[str, Callable[[str], Any]] = {f: _coerce_int for f in _INT_FIELDS}
+_STATS_DTYPE["SH_PCT"] = _coerce_float
+_STATS_RENAME = {"PN-PIM": "PN_PIM"}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL + synchronous=NORMAL: one fsync per checkpoint instead of per commit
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+@contextmanager
+def begin_immediate(engine: Engine) -> Iterator[Connection]:
+    """`engine.begin()` for bulk loads: on SQLite, take the write lock up front.
+
+    Avoids upgrading a deferred lock mid-transaction. Only load paths use this;
+    ordinary transactions (e.g. read-only `Session` queries) keep a plain BEGIN
+    so WAL readers are never blocked by a writer.
+    """
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            # pysqlite has not begun yet (it only auto-BEGINs before DML), so this opens the transaction
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        yield conn
+
+
+def create_tables(engine: Engine) -> None:
+    """Run `create_all` once per engine; later calls skip the table probing."""
+    if engine not in _SCHEMA_CREATED:
+        SQLModel.metadata.create_all(engine)
+        _SCHEMA_CREATED.add(engine)
+
+
+@lru_cache(maxsize=None)
+def get_engine(db_url: str = "sqlite:///hurst.db") -> Engine:
+    """Return a shared engine (with tables created) for `db_url`."""
+    engine = create_engine(db_url)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    create_tables(engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def _insert_sql(table: Table) -> str:
+    cols = list(table.columns.keys())
+    col_list = ", ".join(f'"{c}"' for c in cols)
+    placeholders = ", ".join(f":{c}" for c in cols)
+    return f'INSERT OR REPLACE INTO "{table.name}" ({col_list}) VALUES ({placeholders})'
+
+
+def insert_rows(conn: Connection, model: Type[SQLModel], rows: Iterable[Dict[str, Any]]) -> None:
+    """Bulk upsert `rows` (dicts keyed by column) into `model`'s table.
+
+    On SQLite, hands a prebuilt INSERT OR REPLACE straight to the driver's
+    executemany, skipping Core statement compilation and per-row bind
+    processing. `rows` may be a generator: sqlite3 consumes it lazily, so rows
+    are never all held in memory. Rows whose primary key (FirstName, LastName)
+    already exists are replaced, so re-running a load is idempotent.
+
+    Other dialects get a plain Core executemany INSERT (no upsert).
+    """
+    if conn.dialect.name != "sqlite":
+        rows = list(rows)
+        if rows:  # an empty parameter list would insert a single default row
+            conn.execute(model.__table__.insert(), rows)
+        return
+
+    # the raw DBAPI cursor shares `conn`'s connection, so this runs inside its transaction
+    cursor = conn.connection.cursor()
+    try:
+        cursor.executemany(_insert_sql(model.__table__), rows)
+    finally:
+        cursor.close()
+
+
 def make_bio_instances(csv_path: str = "bio.csv") -> List[Bio]:
     """Read `csv_path` and return a list of `Bio` instances (no DB operations)."""
-    csv_file = HERE / csv_path
-    bios: List[Bio] = []
-    with csv_file.open() as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            num = _coerce_int(row.get("Number", ""))
-            bio = Bio(
-                Number=num,
-                Player=(row.get("Player") or "").strip(),
-                FirstName=(row.get("FirstName") or "").strip(),
-                LastName=(row.get("LastName") or "").strip(),
-                Position=(row.get("Position") or "").strip(),
-                Height=(row.get("Height") or "").strip(),
-                Weight=(row.get("Weight") or "").strip(),
-                Class=(row.get("Class") or "").strip(),
-                Hometown=(row.get("Hometown") or "").strip(),
-                HighSchool=(row.get("HighSchool") or "").strip(),
-            )
-            bios.append(bio)
-    return bios
+    return [Bio(**kw) for kw in stream_bio_rows(csv_path)]
 
 
 def make_stats_instances(csv_path: str = "stats.csv") -> List[Stats]:
     """Read `csv_path` and return a list of `Stats` instances (no DB operations)."""
-    csv_file = HERE / csv_path
-    rows: List[Stats] = []
-    int_fields = {"GP", "G", "A", "PTS", "SH", "plus_minus", "PPG", "SHG", "FG", "GWG", "GTG", "OTG", "HTG", "UAG", "MIN", "MAJ", "OTH", "BLK", "Number"}
+    return [Stats(**kw) for kw in stream_stats_rows(csv_path)]
 
-    with csv_file.open() as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            kw = {}
-            kw["Number"] = _coerce_int(row.get("Number", ""))
-            kw["FirstName"] = (row.get("FirstName") or "").strip()
-            kw["LastName"] = (row.get("LastName") or "").strip()
-
-            for key, val in row.items():
-                if key in ("Number", "FirstName", "LastName"):
-                    continue
-                if key == "PN-PIM":
-                    kw["PN_PIM"] = (val or "").strip()
-                    continue
-                if key in int_fields:
-                    kw[key] = _coerce_int(val)
-                elif key == "SH_PCT":
-                    kw[key] = _coerce_float(val)
-                else:
-                    kw[key] = (val or "").strip()
-
-            stat = Stats(**kw)
-            rows.append(stat)
-    return rows
-
-
-def load_bios(db_url: str = "sqlite:///hurst.db", csv_path: str = "bio.csv") -> List[Bio]:
-    """Create DB/tables, load `csv_path` into `Bio` rows, return list of `Bio` instances."""
-    engine = create_engine(db_url)
-    SQLModel.metadata.create_all(engine)
 
+def _stream_csv(
+    csv_path: str,
+    model: Type[SQLModel],
+    dtype: Dict[str, Callable[[str], Any]],
+    rename: Optional[Dict[str, str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield `csv_path` rows as dicts, coercing each column with `dtype` (default: strip).
+
+    Coercers and output names are resolved once from the header, then each row
+    is zipped against them positionally (no per-row DictReader dict). Short rows
+    are padded with "" and columns of `model`'s table that the CSV lacks get the
+    coerced empty value, so every row carries every column.
+    """
     csv_file = HERE / csv_path
-    bios: List[Bio] = []
+    rename = rename or {}
     with csv_file.open() as fh:
-        reader = csv.DictReader(fh)
+        reader = csv.reader(fh)
+        header = next(reader, [])
+        width = len(header)
+        names = [rename.get(col, col) for col in header]
+        # csv.reader cells are always str, so text columns use the C-level str.strip
+        coerce = [dtype.get(col, str.strip) for col in header]
+        missing = {
+            col: dtype.get(col, str.strip)("")
+            for col in model.__table__.columns.keys()
+            if col not in names
+        }
         for row in reader:
-            num = _coerce_int(row.get("Number", ""))
-            bio = Bio(
-                Number=num,
-                Player=(row.get("Player") or "").strip(),
-                FirstName=(row.get("FirstName") or "").strip(),
-                LastName=(row.get("LastName") or "").strip(),
-                Position=(row.get("Position") or "").strip(),
-                Height=(row.get("Height") or "").strip(),
-                Weight=(row.get("Weight") or "").strip(),
-                Class=(row.get("Class") or "").strip(),
-                Hometown=(row.get("Hometown") or "").strip(),
-                HighSchool=(row.get("HighSchool") or "").strip(),
-            )
-            bios.append(bio)
-
-    with Session(engine) as session:
-        session.add_all(bios)
-        session.commit()
-
-    return bios
-
-
-def load_stats(db_url: str = "sqlite:///hurst.db", csv_path: str = "stats.csv") -> List[Stats]:
-    """Create DB/tables, load `csv_path` into `Stats` rows, return list of `Stats` instances.
+            if not row:  # skip blank lines, as DictReader did
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            record = {name: fn(val) for name, fn, val in zip(names, coerce, row)}
+            if missing:
+                record.update(missing)
+            yield record
+
+
+def stream_bio_rows(csv_path: str = "bio.csv") -> Iterator[Dict[str, Any]]:
+    """Yield plain dicts keyed by `Bio` column from `csv_path` (no ORM objects)."""
+    return _stream_csv(csv_path, Bio, _BIO_DTYPE)
+
+
+def stream_stats_rows(csv_path: str = "stats.csv") -> Iterator[Dict[str, Any]]:
+    """Yield plain dicts keyed by `Stats` column from `csv_path` (no ORM objects).
 
+    Note: maps header `PN-PIM` -> column `PN_PIM`.
+    """
+    return _stream_csv(csv_path, Stats, _STATS_DTYPE, rename=_STATS_RENAME)
+
+
+def load_bios(
+    db_url: str = "sqlite:///hurst.db",
+    csv_path: str = "bio.csv",
+    engine: Optional[Engine] = None,
+) -> List[Bio]:
+    """Create DB/tables, bulk insert `csv_path` into `bio`, return list of `Bio` instances.
+
+    Uses `engine` if given, otherwise the shared engine for `db_url`.
+    """
+    if engine is None:
+        engine = get_engine(db_url)
+    else:
+        create_tables(engine)
+
+    bios = list(stream_bio_rows(csv_path))
+    with begin_immediate(engine) as conn:
+        insert_rows(conn, Bio, bios)
+
+    # models are built only after the bulk insert, off the hot path
+    return [Bio(**kw) for kw in bios]
+
+
+def load_stats(
+    db_url: str = "sqlite:///hurst.db",
+    csv_path: str = "stats.csv",
+    engine: Optional[Engine] = None,
+) -> List[Stats]:
+    """Create DB/tables, bulk insert `csv_path` into `stats`, return list of `Stats` instances.
+
+    Uses `engine` if given, otherwise the shared engine for `db_url`.
     Note: maps header `PN-PIM` -> attribute `PN_PIM`.
     """
-    engine = create_engine(db_url)
-    SQLModel.metadata.create_all(engine)
+    if engine is None:
+        engine = get_engine(db_url)
+    else:
+        create_tables(engine)
 
-    csv_file = HERE / csv_path
-    rows: List[Stats] = []
-    int_fields = {"GP", "G", "A", "PTS", "SH", "plus_minus", "PPG", "SHG", "FG", "GWG", "GTG", "OTG", "HTG", "UAG", "MIN", "MAJ", "OTH", "BLK", "Number"}
+    rows = list(stream_stats_rows(csv_path))
+    with begin_immediate(engine) as conn:
+        insert_rows(conn, Stats, rows)
 
-    with csv_file.open() as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            kw = {}
-            # direct mappings
-            kw["Number"] = _coerce_int(row.get("Number", ""))
-            kw["FirstName"] = (row.get("FirstName") or "").strip()
-            kw["LastName"] = (row.get("LastName") or "").strip()
-
-            for key, val in row.items():
-                if key in ("Number", "FirstName", "LastName"):
-                    continue
-                if key == "PN-PIM":
-                    kw["PN_PIM"] = (val or "").strip()
-                    continue
-                if key in int_fields:
-                    kw[key] = _coerce_int(val)
-                elif key == "SH_PCT":
-                    kw[key] = _coerce_float(val)
-                else:
-                    # keep as string
-                    kw[key] = (val or "").strip()
-
-            stat = Stats(**kw)
-            rows.append(stat)
-
-    with Session(engine) as session:
-        session.add_all(rows)
-        session.commit()
-
-    return rows
+    # models are built only after the bulk insert, off the hot path
+    return [Stats(**kw) for kw in rows]
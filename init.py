@@ -1,15 +1,10 @@
-from sqlmodel import SQLModel, create_engine, Session
-from db_loader import make_bio_instances, make_stats_instances
+from db_loader import begin_immediate, get_engine, insert_rows, stream_bio_rows, stream_stats_rows
 from models import Bio, Stats
 
-engine = create_engine("sqlite:///hurst_hockey.db")
-SQLModel.metadata.create_all(engine)
+engine = get_engine("sqlite:///hurst_hockey.db")
 
-with Session(engine) as session:
-    bios = make_bio_instances("bio.csv")
-    session.add_all(bios)
-    session.commit()
-
-    stats = make_stats_instances("stats.csv")
-    session.add_all(stats)
-    session.commit()
+# CSV rows stream straight into executemany as plain dicts: no Bio/Stats objects or row lists are built.
+# Both tables load in one transaction -> a single commit/fsync.
+with begin_immediate(engine) as conn:
+    insert_rows(conn, Bio, stream_bio_rows("bio.csv"))
+    insert_rows(conn, Stats, stream_stats_rows("stats.csv"))
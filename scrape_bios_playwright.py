@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """Scrape player bios from the roster using Playwright and write bio.csv
 
+Playwright only renders the pages; each page's HTML is pulled out once with
+`page.content()` and parsed in-process by the lxml extractor shared with
+`scrape_bios_requests.py`, instead of one browser round-trip per field.
+
 Usage:
   python3 scrape_bios_playwright.py
 
@@ -9,95 +13,25 @@ Requires: Playwright installed (`pip install playwright` and `playwright install
 from pathlib import Path
 import csv
 import sys
-from typing import List, Dict
+from typing import List
 
+from lxml import html
 from playwright.sync_api import sync_playwright
 
+from scrape_bios_requests import (
+    HEADERS,
+    PLAYER_X,
+    extract_from_profile,
+    extract_from_profile_html,
+    gather_profile_links,
+)
+
 HERE = Path(__file__).parent
 OUT_CSV = HERE / "bio.csv"
 ROSTER_URL = "https://hurstathletics.com/sports/mens-ice-hockey/roster"
 
-HEADERS = [
-    "Number",
-    "Player",
-    "FirstName",
-    "LastName",
-    "Position",
-    "Height",
-    "Weight",
-    "Class",
-    "Hometown",
-    "HighSchool",
-]
-
-
-def normalize(s: str) -> str:
-    return " ".join(s.replace("\xa0", " ").split()).strip()
-
-
-def extract_from_profile(page) -> Dict[str, str]:
-    data: Dict[str, str] = {h: "" for h in HEADERS}
-
-    # Number
-    num_el = page.query_selector("span.sidearm-roster-player-jersey-number")
-    if num_el:
-        data["Number"] = normalize(num_el.inner_text())
-
-    # Name
-    name_el = page.query_selector("span.sidearm-roster-player-name")
-    if name_el:
-        parts = [normalize(span.inner_text()) for span in name_el.query_selector_all("span")]
-        full = " ".join(parts).strip()
-        data["Player"] = full
-        if parts:
-            data["FirstName"] = parts[0]
-            data["LastName"] = parts[-1]
-
-    # Image (not used in CSV headers requested, but could be helpful)
-    img_el = page.query_selector(".sidearm-roster-player-image img")
-    if img_el:
-        src = normalize(img_el.get_attribute("src") or "")
-        # store image path in HighSchool field if missing - but we don't include it now
-
-    # dt/dd fields in the header info
-    dl_elems = page.query_selector_all(".sidearm-roster-player-fields dl")
-    for dl in dl_elems:
-        dt = dl.query_selector("dt")
-        dd = dl.query_selector("dd")
-        if not dt or not dd:
-            continue
-        key = normalize(dt.inner_text()).rstrip(":")
-        val = normalize(dd.inner_text())
-        if key.lower().startswith("position"):
-            data["Position"] = val
-        elif key.lower().startswith("height"):
-            data["Height"] = val
-        elif key.lower().startswith("weight"):
-            data["Weight"] = val
-        elif key.lower().startswith("class"):
-            data["Class"] = val
-        elif key.lower().startswith("hometown"):
-            data["Hometown"] = val
-        elif key.lower().startswith("high school") or key.lower().startswith("highschool"):
-            data["HighSchool"] = val
-
-    return data
-
-
-def gather_profile_links(page) -> List[str]:
-    # Select links that look like player profile links under the roster
-    anchors = page.query_selector_all('a[href*="/sports/mens-ice-hockey/roster/"]')
-    hrefs = []
-    for a in anchors:
-        href = a.get_attribute("href")
-        if not href:
-            continue
-        # Normalize to absolute
-        if href.startswith("/"):
-            href = "https://hurstathletics.com" + href
-        if href not in hrefs:
-            hrefs.append(href)
-    return hrefs
+# a roster card missing any of these falls back to visiting the profile page
+REQUIRED = ("FirstName", "LastName", "Position")
 
 
 def main() -> None:
@@ -109,15 +43,39 @@ def main() -> None:
         page.goto(ROSTER_URL, timeout=60000)
         page.wait_for_selector(".sidearm-roster-player-name", timeout=60000)
 
-        profile_links = gather_profile_links(page)
-        print(f"Found {len(profile_links)} profile links")
+        # roster cards already carry the bio fields: read them in place
+        tree = html.fromstring(page.content())
+        cards = PLAYER_X(tree)
+        print(f"Found {len(cards)} roster cards")
 
-        for i, url in enumerate(profile_links, start=1):
+        fallback: List[str] = []
+        for card in cards:
+            try:
+                data = extract_from_profile(card)
+            except Exception as exc:
+                print(f"Failed to read roster card: {exc}", file=sys.stderr)
+                data = {h: "" for h in HEADERS}
+            if all(data[h] for h in REQUIRED):
+                rows.append([data[h] for h in HEADERS])
+                continue
+            links = gather_profile_links(card)
+            if links:
+                fallback.append(links[0])
+            else:
+                missing = ", ".join(h for h in REQUIRED if not data[h])
+                print(f"Skipping roster card {data['Player'] or '(unnamed)'}: missing {missing} and no profile link", file=sys.stderr)
+
+        # layout without roster cards: visit every profile linked from the page
+        if not cards:
+            fallback = gather_profile_links(tree)
+            print(f"No roster cards; visiting {len(fallback)} profile links")
+
+        for i, url in enumerate(fallback, start=1):
             try:
-                print(f"[{i}/{len(profile_links)}] Visiting {url}")
+                print(f"[{i}/{len(fallback)}] Visiting {url}")
                 page.goto(url, timeout=60000)
                 page.wait_for_selector(".sidearm-roster-player-header-details", timeout=30000)
-                data = extract_from_profile(page)
+                data = extract_from_profile_html(page.content())
                 rows.append([data[h] for h in HEADERS])
             except Exception as exc:
                 print(f"Failed to scrape {url}: {exc}", file=sys.stderr)
@@ -1,25 +1,73 @@
 #!/usr/bin/env python3
-"""Scrape player bios from the roster using requests + BeautifulSoup
+"""Scrape player bios from the roster using requests + lxml
 
-This is a fallback when Playwright/browser can't be started. It attempts
-to parse profile links from the roster page and then fetches each profile
-page to extract the requested fields.
+This is a fallback when Playwright/browser can't be started. It first asks
+the Sidearm roster feed for every player in one JSON request; if that is
+unavailable it parses profile links from the roster page and then fetches
+each profile page to extract the requested fields.
+
+Profile pages are fetched concurrently over one multiplexed HTTP/2
+connection when `httpx` (and `h2`) are installed, otherwise over a
+thread pool of `requests` workers.
 
 Usage:
   python3 scrape_bios_requests.py
 
+For development, run with `HURST_SCRAPE_CACHE=1` (needs `requests-cache`) to
+cache responses on disk for a day so repeated runs skip the network.
+
 Requires: `pip install -r requirements.txt`
+Optional: `pip install "httpx[http2]" requests-cache`
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import asyncio
 import csv
-import time
-from typing import List, Dict
+import importlib.util
+import os
+import re
+from typing import List, Dict, Optional, Tuple
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # optional: profiles are fetched with the requests thread pool instead
+    httpx = None
+
+try:
+    import requests_cache
+except ImportError:  # optional: dev-loop cache of fetched pages
+    requests_cache = None
+
+HTTP2 = importlib.util.find_spec("h2") is not None
 
 HERE = Path(__file__).parent
 OUT_CSV = HERE / "bio.csv"
 ROSTER_URL = "https://hurstathletics.com/sports/mens-ice-hockey/roster"
+ROSTER_JSON_URL = "https://hurstathletics.com/services/roster_feed.aspx?path=mhockey"
+MAX_WORKERS = 8
+CACHE_PATH = HERE / "hurst_cache"
+CACHE_EXPIRE = 86400  # seconds
+# opt-in: a cached run reads pages up to CACHE_EXPIRE old
+CACHE_ENABLED = os.environ.get("HURST_SCRAPE_CACHE", "") not in ("", "0")
+
+
+def _has_class(name: str) -> str:
+    # XPath equivalent of the CSS `.name` class-token match
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+# selectors are compiled once at import instead of per page
+NUM_X = etree.XPath(f".//span[{_has_class('sidearm-roster-player-jersey-number')}]")
+NAME_X = etree.XPath(f".//span[{_has_class('sidearm-roster-player-name')}]")
+SPAN_X = etree.XPath(".//span")
+DL_X = etree.XPath(f".//*[{_has_class('sidearm-roster-player-fields')}]//dl")
+DT_X = etree.XPath(".//dt")
+DD_X = etree.XPath(".//dd")
+PLAYER_X = etree.XPath(f".//*[{_has_class('sidearm-roster-player')}]")
+HREF_X = etree.XPath(".//a/@href")
 
 HEADERS = [
     "Number",
@@ -35,43 +83,65 @@ HEADERS = [
 ]
 
 
+_WS = re.compile(r"[\s\xa0]+")
+
+
 def normalize(s: str) -> str:
-    if not s:
-        return ""
-    return " ".join(s.replace("\xa0", " ").split()).strip()
+    # single pass collapsing whitespace runs (incl. nbsp) instead of replace + split + join
+    return _WS.sub(" ", s).strip() if s else ""
+
+
+def text_of(node) -> str:
+    return normalize("".join(node.itertext()))
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """Return the charset named in a Content-Type header, if any."""
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            return value.strip().strip("\"'") or None
+    return None
+
 
+def parse_html(content, encoding: Optional[str] = None) -> html.HtmlElement:
+    """Parse HTML in C with libxml2, decoding bytes with the HTTP-declared `encoding`.
 
-def get_soup(url: str, session: requests.Session) -> BeautifulSoup:
+    Without a declared charset libxml2 sniffs `<meta charset>`, then assumes Latin-1.
+    """
+    parser = html.HTMLParser(encoding=encoding) if encoding and isinstance(content, bytes) else None
+    return html.fromstring(content, parser=parser)
+
+
+def get_tree(url: str, session: requests.Session) -> html.HtmlElement:
     resp = session.get(url, timeout=30)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    return parse_html(resp.content, header_charset(resp.headers.get("Content-Type", "")))
 
 
-def gather_profile_links(soup: BeautifulSoup) -> List[str]:
-    anchors = soup.find_all("a", href=True)
-    hrefs: List[str] = []
-    for a in anchors:
-        href = a["href"]
+def gather_profile_links(tree: html.HtmlElement) -> List[str]:
+    # dict keys as an ordered set: O(1) de-duplication, first-seen order kept
+    hrefs: Dict[str, None] = {}
+    for href in HREF_X(tree):
         if "/sports/mens-ice-hockey/roster/" in href and href not in ("/sports/mens-ice-hockey/roster", "https://hurstathletics.com/sports/mens-ice-hockey/roster"):
             if href.startswith("/"):
                 href = "https://hurstathletics.com" + href
-            if href not in hrefs:
-                hrefs.append(href)
-    return hrefs
+            hrefs[href] = None
+    return list(hrefs)
 
 
-def extract_from_profile(soup: BeautifulSoup) -> Dict[str, str]:
+def extract_from_profile(tree: html.HtmlElement) -> Dict[str, str]:
     data = {h: "" for h in HEADERS}
 
-    num_el = soup.select_one("span.sidearm-roster-player-jersey-number")
-    if num_el:
-        data["Number"] = normalize(num_el.get_text())
+    num_els = NUM_X(tree)
+    if num_els:
+        data["Number"] = text_of(num_els[0])
 
-    name_el = soup.select_one("span.sidearm-roster-player-name")
-    if name_el:
-        parts = [normalize(span.get_text()) for span in name_el.find_all("span")]
+    name_els = NAME_X(tree)
+    if name_els:
+        parts = [text_of(span) for span in SPAN_X(name_els[0])]
         if not parts:
-            full = normalize(name_el.get_text())
+            full = text_of(name_els[0])
             parts = full.split()
         else:
             full = " ".join(parts).strip()
@@ -81,13 +151,13 @@ def extract_from_profile(soup: BeautifulSoup) -> Dict[str, str]:
             data["LastName"] = parts[-1]
 
     # dl fields container
-    for dl in soup.select(".sidearm-roster-player-fields dl"):
-        dt = dl.find("dt")
-        dd = dl.find("dd")
-        if not dt or not dd:
+    for dl in DL_X(tree):
+        dts = DT_X(dl)
+        dds = DD_X(dl)
+        if not dts or not dds:
             continue
-        key = normalize(dt.get_text()).rstrip(":")
-        val = normalize(dd.get_text())
+        key = text_of(dts[0]).rstrip(":")
+        val = text_of(dds[0])
         lk = key.lower()
         if lk.startswith("position"):
             data["Position"] = val
@@ -105,44 +175,161 @@ def extract_from_profile(soup: BeautifulSoup) -> Dict[str, str]:
     return data
 
 
-def main() -> None:
-    session = requests.Session()
+def _json_field(obj, *path: str) -> str:
+    for key in path:
+        if not isinstance(obj, dict):
+            return ""
+        obj = obj.get(key)
+    return normalize(str(obj)) if obj is not None else ""
+
+
+def player_from_json(player: Dict) -> Dict[str, str]:
+    data = {h: "" for h in HEADERS}
+    data["Number"] = _json_field(player, "jersey")
+    data["FirstName"] = _json_field(player, "name", "first")
+    data["LastName"] = _json_field(player, "name", "last")
+    data["Player"] = " ".join(p for p in (data["FirstName"], data["LastName"]) if p)
+    data["Position"] = _json_field(player, "bio", "position")
+    data["Height"] = _json_field(player, "bio", "height")
+    data["Weight"] = _json_field(player, "bio", "weight")
+    data["Class"] = _json_field(player, "bio", "class")
+    data["Hometown"] = _json_field(player, "bio", "hometown")
+    data["HighSchool"] = _json_field(player, "bio", "highschool")
+    return data
+
+
+def fetch_roster_json(session: requests.Session) -> List[Dict[str, str]]:
+    """Fetch all players from the roster feed in a single request."""
+    resp = session.get(ROSTER_JSON_URL, timeout=30)
+    resp.raise_for_status()
+    payload = resp.json()
+    players = payload.get("players", []) if isinstance(payload, dict) else payload
+    return [player_from_json(p) for p in players]
+
+
+def extract_from_profile_html(content, encoding: Optional[str] = None) -> Dict[str, str]:
+    """Parse a profile page's HTML (bytes or str) and extract its bio fields."""
+    return extract_from_profile(parse_html(content, encoding))
+
+
+def parse_profile(url: str, content: bytes, encoding: Optional[str] = None) -> Optional[Dict[str, str]]:
+    try:
+        return extract_from_profile_html(content, encoding)
+    except Exception as exc:
+        print(f"Failed {url}: {exc}")
+        return None
+
+
+def fetch_profile(url: str, session: requests.Session) -> Optional[Dict[str, str]]:
+    try:
+        resp = session.get(url, timeout=30)
+        resp.raise_for_status()
+    except Exception as exc:
+        print(f"Failed {url}: {exc}")
+        return None
+    return parse_profile(url, resp.content, header_charset(resp.headers.get("Content-Type", "")))
+
+
+async def _fetch_all_async(urls: List[str], headers: Dict[str, str]) -> List:
+    limit = asyncio.Semaphore(MAX_WORKERS)
+    async with httpx.AsyncClient(http2=HTTP2, headers=headers, timeout=30, follow_redirects=True) as client:
+
+        async def fetch(url: str) -> Tuple[bytes, Optional[str]]:
+            async with limit:
+                resp = await client.get(url)
+            resp.raise_for_status()
+            return resp.content, resp.charset_encoding
+
+        return await asyncio.gather(*(fetch(u) for u in urls), return_exceptions=True)
+
+
+def fetch_profiles(urls: List[str], session: requests.Session) -> List[Optional[Dict[str, str]]]:
+    """Fetch and parse every profile page concurrently, in `urls` order."""
+    # cached sessions serve repeat runs from disk, so keep them on the requests path
+    cached = requests_cache is not None and isinstance(session, requests_cache.CachedSession)
+    if httpx is None or cached:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            return list(ex.map(lambda u: fetch_profile(u, session), urls))
+
+    bodies = asyncio.run(_fetch_all_async(urls, dict(session.headers)))
+    results: List[Optional[Dict[str, str]]] = []
+    for url, body in zip(urls, bodies):
+        if isinstance(body, Exception):
+            print(f"Failed {url}: {body}")
+            results.append(None)
+        else:
+            content, encoding = body
+            results.append(parse_profile(url, content, encoding))
+    return results
+
+
+def write_csv(rows: List[List[str]]) -> None:
+    with OUT_CSV.open("w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+    print(f"Wrote {len(rows)} bios to {OUT_CSV}")
+
+
+def make_session(use_cache: bool = False) -> requests.Session:
+    session = None
+    if use_cache:
+        if requests_cache is not None:
+            session = requests_cache.CachedSession(str(CACHE_PATH), expire_after=CACHE_EXPIRE)
+        else:
+            print("Page cache requested but requests-cache is not installed; fetching uncached")
+    if session is None:
+        session = requests.Session()
     session.headers.update({"User-Agent": "Mozilla/5.0 (compatible; bio-scraper/1.0)"})
+    # size the connection pool so concurrent workers reuse connections instead of discarding them
+    adapter = HTTPAdapter(pool_connections=2 * MAX_WORKERS, pool_maxsize=2 * MAX_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def main() -> None:
+    session = make_session(use_cache=CACHE_ENABLED)
+
+    print(f"Fetching roster feed: {ROSTER_JSON_URL}")
+    rows: List[List[str]] = []
+    try:
+        players = [data for data in fetch_roster_json(session) if data["LastName"]]
+        # the feed's field names are unverified: only trust it when names *and*
+        # bio fields mapped, otherwise the HTML scrape gives complete rows
+        if players and all(data["Position"] for data in players):
+            rows = [[data[h] for h in HEADERS] for data in players]
+        else:
+            print("Roster feed missing expected name/bio fields; falling back to HTML scrape")
+    except Exception as exc:
+        print(f"Roster feed unavailable ({exc}); falling back to HTML scrape")
+    if rows:
+        write_csv(rows)
+        return
 
     print(f"Fetching roster page: {ROSTER_URL}")
-    soup = get_soup(ROSTER_URL, session)
-    profile_links = gather_profile_links(soup)
+    tree = get_tree(ROSTER_URL, session)
+    profile_links = gather_profile_links(tree)
     print(f"Found {len(profile_links)} profile links (attempting to fetch each)")
 
-    rows: List[List[str]] = []
-    for i, url in enumerate(profile_links, start=1):
-        try:
-            print(f"[{i}/{len(profile_links)}] {url}")
-            psoup = get_soup(url, session)
-            data = extract_from_profile(psoup)
-            rows.append([data[h] for h in HEADERS])
-        except Exception as exc:
-            print(f"Failed {url}: {exc}")
-        time.sleep(0.5)
+    # profile fetches are network-bound: run them concurrently, results keep roster order
+    results = fetch_profiles(profile_links, session)
+    rows = [[data[h] for h in HEADERS] for data in results if data is not None]
+    print(f"Scraped {len(rows)}/{len(profile_links)} profile pages")
 
     # If we didn't find any links, fall back to scanning roster page for inline player blocks
     if not rows:
         print("No profile pages scraped; attempting to parse roster page entries directly")
         # Try to find roster player blocks on the roster page
-        for player_div in soup.select(".sidearm-roster-player"):  # best-effort
+        for player_div in PLAYER_X(tree):  # best-effort
             try:
                 pdata = extract_from_profile(player_div)
                 rows.append([pdata[h] for h in HEADERS])
             except Exception:
                 continue
 
-    # Write CSV
-    with OUT_CSV.open("w", newline="") as fh:
-        writer = csv.writer(fh)
-        writer.writerow(HEADERS)
-        writer.writerows(rows)
-
-    print(f"Wrote {len(rows)} bios to {OUT_CSV}")
+    write_csv(rows)
 
 
 if __name__ == "__main__":